@@ -80,6 +80,24 @@ class Ego:
         """Function which will be called every timestep. To be overridden by subclasses as needed."""
         pass
 
+    def fetch_state(self):
+        """
+        Polls any data the Ego needs from TraCI without modifying the Ego or the listener.
+        Used together with apply_state() by Simulation.update_async(). To be overridden by subclasses as needed.
+        :return: state to be passed to apply_state()
+        """
+        return None
+
+    def apply_state(self, state):
+        """
+        Updates the Ego and the listener from a state previously returned by fetch_state(). Should make no TraCI calls.
+        By default, this simply calls update(). Simulation.update_async() runs this on its audio worker thread, so
+        subclasses whose update() calls TraCI should override fetch_state() and apply_state() instead.
+        :param state: state returned by fetch_state()
+        :return: None
+        """
+        self.update()
+
 
 class EgoVehicle(Ego):
     """
@@ -96,10 +114,6 @@ class EgoVehicle(Ego):
         super().__init__()
         self.vehID = vehID
         self.subscribed = False
-        vehicle_list = traci.vehicle.getIDList()
-        if self.vehID in vehicle_list:
-            self.subscribe()
-            self.subscribed = True
         self.position = (0, 0, 0)
         self.listener_offset = listener_offset
         self.angle = 0
@@ -108,6 +122,7 @@ class EgoVehicle(Ego):
     def subscribe(self):
         """Adds a TraCI subscription for the ego vehicle"""
         traci.vehicle.subscribe(self.vehID, (tc.VAR_POSITION3D, tc.VAR_ANGLE, tc.VAR_SPEED))
+        self.subscribed = True
 
     def get_velocity_vector(self):
         """Calculates the velocity vector of the Ego vehicle."""
@@ -126,19 +141,34 @@ class EgoVehicle(Ego):
         Should be run every simulation step.
         :return: None
         """
+        self.apply_state(self.fetch_state())
+
+    def fetch_state(self):
+        """
+        Polls vehicle subscription data from TraCI, subscribing first if necessary.
+        :return: (position, angle, speed) tuple, or None if the vehicle is not (yet) in the simulation
+        """
         if not self.subscribed:
             vehicle_list = traci.vehicle.getIDList()
             if self.vehID in vehicle_list:
                 self.subscribe()
             else:
-                return
+                return None
         subscription_result = traci.vehicle.getSubscriptionResults(self.vehID)
         position = subscription_result[tc.VAR_POSITION3D]
         angle = subscription_result[tc.VAR_ANGLE]
         speed = subscription_result[tc.VAR_SPEED]
-        self.position = position
-        self.angle = angle
-        self.speed = speed
+        return position, angle, speed
+
+    def apply_state(self, state):
+        """
+        Updates the Ego Vehicle and the listener from a state previously returned by fetch_state().
+        :param state: (position, angle, speed) tuple, or None
+        :return: None
+        """
+        if state is None:
+            return
+        self.position, self.angle, self.speed = state
         self._set_listener_properties()
 
     def _set_listener_properties(self):
@@ -169,21 +199,16 @@ class EgoVehicleManualSpeed(EgoVehicle):
         super().__init__(vehID, listener_offset)
         self.last_position = None
 
-    def update(self):
+    def apply_state(self, state):
         """
-        Polls vehicle subscription data from TraCI and updates the vehicle accordingly.
-        Should be run every simulation step.
+        Updates the Ego Vehicle and the listener from a state previously returned by fetch_state().
+        The reported speed is ignored and calculated from the change in position instead.
+        :param state: (position, angle, speed) tuple, or None
         :return: None
         """
-        if not self.subscribed:
-            vehicle_list = traci.vehicle.getIDList()
-            if self.vehID in vehicle_list:
-                self.subscribe()
-            else:
-                return
-        subscription_result = traci.vehicle.getSubscriptionResults(self.vehID)
-        position = subscription_result[tc.VAR_POSITION3D]
-        angle = subscription_result[tc.VAR_ANGLE]
+        if state is None:
+            return
+        position, angle, _ = state
         self.position = position
         self.angle = angle
         if self.last_position is not None:
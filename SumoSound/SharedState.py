@@ -0,0 +1,277 @@
+"""
+Classes to run TraCI and the sound rendering in separate processes, connected by a shared-memory ring buffer.
+
+The SharedStateProducer runs next to the TraCI client and writes the ego and vehicle states of each simulation step
+into a fixed-size ring of frame slots in shared memory. The SharedMemorySimulation runs in the audio process and reads
+the latest complete frame without making any TraCI calls. Each slot is guarded by a sequence number (a seqlock), so
+neither side ever blocks the other: a frame which is overwritten while being read is simply discarded and re-read.
+"""
+
+from .Simulation import *
+import traci
+import traci.constants as tc
+import os
+import struct
+import sys
+import warnings
+
+try:
+    from multiprocessing import resource_tracker, shared_memory
+except ImportError:  # Python < 3.8
+    resource_tracker = shared_memory = None
+
+_MAGIC = b"SSND"
+_ID_LENGTH = 64
+_VCLASS_LENGTH = 16
+# all structs are padded to multiples of 8 bytes, so that the 8-byte counters and doubles are naturally aligned
+_HEADER = struct.Struct("<4sII4x")  # magic, slot count, max vehicles
+_LATEST = struct.Struct("<Q")  # number of the latest complete frame
+_SEQUENCE = struct.Struct("<Q")  # odd while the slot is being written
+_SLOT_HEADER = struct.Struct("<Q?7x5dI4x")  # frame number, ego present, ego x, y, z, angle, speed, vehicle count
+_RECORD = struct.Struct("<" + str(_ID_LENGTH) + "s" + str(_VCLASS_LENGTH) + "s5d")  # id, vClass, x, y, z, angle, speed
+_LATEST_OFFSET = _HEADER.size
+_SLOTS_OFFSET = _LATEST_OFFSET + _LATEST.size
+
+_created_blocks = set()  # names of the shared-memory blocks created by producers in this process
+
+
+def _slot_size(max_vehicles):
+    return _SEQUENCE.size + _SLOT_HEADER.size + max_vehicles * _RECORD.size
+
+
+def _check_shared_memory_support():
+    if shared_memory is None:
+        raise RuntimeError("Shared-memory state feeds require Python 3.8 or newer.")
+
+
+def _attach_shared_memory(name):
+    """
+    Attaches to an existing shared-memory block without taking ownership of it. Before Python 3.13, attaching
+    registers the block with the resource tracker of the attaching process, which unlinks it when that process exits,
+    even though the block belongs to another process. Blocks created in this process are left registered, since the
+    registration belongs to the producer.
+    :param name: name of the shared-memory block
+    :return: the attached block
+    :rtype: shared_memory.SharedMemory
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    shm = shared_memory.SharedMemory(name=name)
+    if os.name == "posix" and name not in _created_blocks:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+class SharedStateProducer:
+    """
+    Gathers the ego and vehicle states from TraCI and publishes them to a shared-memory ring buffer.
+    Should be run in the process which controls the Sumo simulation. Makes no OpenAL calls.
+    """
+    def __init__(self, name, ego_id=None, max_vehicles=256, slot_count=4):
+        """
+        Initializes a SharedStateProducer object and creates the shared-memory block.
+        :param name: name of the shared-memory block. Must be passed to the SharedMemorySimulation.
+        :param ego_id: Sumo vehicle ID of the ego vehicle, or None if the ego is not a Sumo vehicle
+        :param max_vehicles: maximum number of vehicles per frame. Vehicles closest to the ego are kept.
+        :param slot_count: number of frames in the ring buffer
+        :type name: str
+        :type ego_id: str
+        :type max_vehicles: int
+        :type slot_count: int
+        """
+        _check_shared_memory_support()
+        if slot_count < 2:
+            raise ValueError("slot_count must be at least 2.")
+        self.ego_id = ego_id
+        self.max_vehicles = max_vehicles
+        self.slot_count = slot_count
+        self.frame_number = 0
+        self._vehicle_classes = dict()  # type: dict[str: str]
+        self._skipped_ids = set()  # IDs too long to be published
+        self._overflow_warned = False
+        self._long_id_warned = False
+        size = _SLOTS_OFFSET + slot_count * _slot_size(max_vehicles)
+        self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _created_blocks.add(name)
+        _HEADER.pack_into(self.shm.buf, 0, _MAGIC, slot_count, max_vehicles)
+        _LATEST.pack_into(self.shm.buf, _LATEST_OFFSET, 0)
+
+    def update(self):
+        """
+        Polls the vehicle states from TraCI and publishes them as a new frame. Should be run every simulation step.
+        :return: None
+        """
+        vehicle_list = traci.vehicle.getIDList()
+        for vehID in vehicle_list:
+            if vehID not in self._vehicle_classes and vehID not in self._skipped_ids:
+                if len(vehID.encode("utf-8")) > _ID_LENGTH:
+                    self._skipped_ids.add(vehID)
+                    if not self._long_id_warned:
+                        warnings.warn("Vehicle ID " + vehID + " is longer than " + str(_ID_LENGTH) + " bytes. "
+                                      "Vehicles with such IDs will not be published.", RuntimeWarning)
+                        self._long_id_warned = True
+                    continue
+                traci.vehicle.subscribe(vehID, [tc.VAR_POSITION3D, tc.VAR_ANGLE, tc.VAR_SPEED])
+                self._vehicle_classes[vehID] = traci.vehicle.getVehicleClass(vehID)
+        present = set(vehicle_list)
+        for vehID in [vehID for vehID in self._vehicle_classes if vehID not in present]:
+            del self._vehicle_classes[vehID]
+        self._skipped_ids &= present
+        states = []
+        for vehID in vehicle_list:
+            if vehID in self._vehicle_classes:
+                subscription_result = traci.vehicle.getSubscriptionResults(vehID)
+                states.append((vehID, subscription_result[tc.VAR_POSITION3D], subscription_result[tc.VAR_ANGLE],
+                               subscription_result[tc.VAR_SPEED]))
+        ego_state = None
+        if self.ego_id in self._vehicle_classes:
+            ego_state = next(state[1:] for state in states if state[0] == self.ego_id)
+        if len(states) > self.max_vehicles:
+            if not self._overflow_warned:
+                warnings.warn("More than " + str(self.max_vehicles) + " vehicles in simulation. Only the closest "
+                              "vehicles will be published.", RuntimeWarning)
+                self._overflow_warned = True
+            ex, ey, ez = ego_state[0] if ego_state is not None else (0, 0, 0)
+            states.sort(key=lambda s: (s[1][0]-ex)**2 + (s[1][1]-ey)**2)
+            states = states[:self.max_vehicles]
+        self._write_frame(ego_state, states)
+
+    def _write_frame(self, ego_state, states):
+        """
+        Writes a frame into the next slot of the ring buffer and publishes it.
+        :param ego_state: (position, angle, speed) tuple of the ego, or None
+        :param states: list of (vehID, position, angle, speed) tuples
+        :return: None
+        """
+        self.frame_number += 1
+        buf = self.shm.buf
+        offset = _SLOTS_OFFSET + (self.frame_number % self.slot_count) * _slot_size(self.max_vehicles)
+        _SEQUENCE.pack_into(buf, offset, 2 * self.frame_number - 1)
+        if ego_state is not None:
+            (x, y, z), angle, speed = ego_state
+            _SLOT_HEADER.pack_into(buf, offset + _SEQUENCE.size, self.frame_number, True, x, y, z, angle, speed,
+                                   len(states))
+        else:
+            _SLOT_HEADER.pack_into(buf, offset + _SEQUENCE.size, self.frame_number, False, 0, 0, 0, 0, 0, len(states))
+        record_offset = offset + _SEQUENCE.size + _SLOT_HEADER.size
+        for vehID, (x, y, z), angle, speed in states:
+            _RECORD.pack_into(buf, record_offset, vehID.encode("utf-8"),
+                              self._vehicle_classes[vehID].encode("utf-8"), x, y, z, angle, speed)
+            record_offset += _RECORD.size
+        _SEQUENCE.pack_into(buf, offset, 2 * self.frame_number)
+        _LATEST.pack_into(buf, _LATEST_OFFSET, self.frame_number)
+
+    def close(self):
+        """Closes the producer's access to the shared-memory block."""
+        self.shm.close()
+
+    def unlink(self):
+        """Destroys the shared-memory block. Should be called once after all processes have closed it."""
+        self.shm.unlink()
+        _created_blocks.discard(self.shm.name)
+
+
+class SharedMemorySimulation(Simulation):
+    """
+    Simulation which reads the ego and vehicle states from the shared-memory block of a SharedStateProducer instead
+    of from TraCI. Intended to be run in a separate audio process, which does not need a TraCI connection.
+    The block remains owned by the producer: it is not unlinked when the consumer closes it or exits, so the audio
+    process may be restarted and re-attach at any time.
+    """
+    def __init__(self, name, ego, vehicle_class_map=None, silent_ego=True, max_vehicle_count=None):
+        """
+        Initialize a SharedMemorySimulation object.
+        :param name: name of the shared-memory block created by the SharedStateProducer
+        :param ego: Ego object. If it has a vehID, it is updated from the ego state published by the producer.
+        :param vehicle_class_map: dict with Sumo vClass as keys and Vehicle subclass as values
+        :param silent_ego: if True, the ego vehicle will not emit any sound.
+        :param max_vehicle_count: maximum number of vehicles from which to emit sound. Vehicles closest to Ego are used.
+        :type name: str
+        :type ego: Ego
+        :type vehicle_class_map: dict[str: Vehicle]
+        :type silent_ego: bool
+        :type max_vehicle_count: int
+        """
+        self.shm = None
+        _check_shared_memory_support()
+        super().__init__(ego, vehicle_class_map, silent_ego, max_vehicle_count)
+        self.shm = _attach_shared_memory(name)
+        magic, self.slot_count, self.max_vehicles = _HEADER.unpack_from(self.shm.buf, 0)
+        if magic != _MAGIC:
+            raise ValueError("Shared-memory block " + name + " was not created by a SharedStateProducer.")
+        self.frame_number = 0
+
+    def update(self):
+        """
+        Applies the latest frame published by the producer. Does nothing if no new frame has been published since the
+        last call. May be called at any rate, independently of the simulation step rate.
+        Raises a RuntimeError if sound updates scheduled by update_async() are still pending.
+        :return: None
+        """
+        self._check_no_pending_audio()
+        frame = self.read_frame()
+        if frame is None or frame[0] == self.frame_number:
+            return
+        self._apply_frame(*self._convert_frame(frame))
+
+    def _fetch_frame(self):
+        """Reads the latest frame from shared memory. Used by update_async() in place of TraCI polling."""
+        frame = self.read_frame()
+        if frame is None or frame[0] == self.frame_number:
+            return None, ([], dict(), [])
+        return self._convert_frame(frame)
+
+    def _convert_frame(self, frame):
+        """
+        Converts a frame from read_frame() into the ego state and vehicle frame used by _apply_frame().
+        :param frame: frame returned by read_frame()
+        :return: (ego state, vehicle frame) tuple
+        """
+        self.frame_number, ego_state, records = frame
+        vehicle_list = [record[0] for record in records]
+        vehicle_classes = {record[0]: record[1] for record in records}
+        states = {record[0]: record[2:] for record in records}
+        vehicle_frame = self._build_vehicle_frame(vehicle_list, vehicle_classes.__getitem__, states.__getitem__)
+        if not hasattr(self.ego, "vehID"):
+            ego_state = None
+        return ego_state, vehicle_frame
+
+    def read_frame(self):
+        """
+        Reads the latest complete frame from shared memory. Frames which are overwritten while being read are re-read.
+        The records are copied out of shared memory and only decoded once the slot's sequence number confirms that
+        the copy is consistent.
+        :return: (frame number, ego state, list of (vehID, vClass, position, angle, speed) tuples), or None if the
+            producer has not published a frame yet. The ego state is a (position, angle, speed) tuple or None.
+        """
+        buf = self.shm.buf
+        slot_size = _slot_size(self.max_vehicles)
+        while True:
+            frame_number, = _LATEST.unpack_from(buf, _LATEST_OFFSET)
+            if frame_number == 0:
+                return None
+            offset = _SLOTS_OFFSET + (frame_number % self.slot_count) * slot_size
+            if _SEQUENCE.unpack_from(buf, offset)[0] != 2 * frame_number:
+                continue
+            _, ego_present, x, y, z, angle, speed, count = _SLOT_HEADER.unpack_from(buf, offset + _SEQUENCE.size)
+            count = min(count, self.max_vehicles)  # a torn count must not read past the slot
+            record_offset = offset + _SEQUENCE.size + _SLOT_HEADER.size
+            raw_records = bytes(buf[record_offset:record_offset + count * _RECORD.size])
+            if _SEQUENCE.unpack_from(buf, offset)[0] != 2 * frame_number:
+                continue
+            ego_state = ((x, y, z), angle, speed) if ego_present else None
+            records = []
+            for vehID, vClass, x, y, z, angle, speed in _RECORD.iter_unpack(raw_records):
+                records.append((vehID.rstrip(b"\0").decode("utf-8"), vClass.rstrip(b"\0").decode("utf-8"),
+                                (x, y, z), angle, speed))
+            return frame_number, ego_state, records
+
+    def close(self):
+        """Closes the consumer's access to the shared-memory block."""
+        if self.shm is not None:
+            self.shm.close()
+            self.shm = None
+
+    def __del__(self):
+        self.close()
+        super().__del__()
@@ -7,6 +7,8 @@ from .Vehicle import *
 import traci
 import traci.constants as tc
 import warnings
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 
 DEFAULT_VEHICLE_CLASS_MAP = {
     "ignoring": PassengerVehicle,
@@ -58,30 +60,176 @@ class Simulation:
         self.vehicle_class_map = vehicle_class_map if vehicle_class_map is not None else DEFAULT_VEHICLE_CLASS_MAP
         self.silent_ego = silent_ego
         self.max_vehicle_count = max_vehicle_count
+        self._tracked_vehicles = dict()  # type: dict[str: str]  # vClass of each vehicle known to the TraCI side
+        self._traci_executor = None  # type: ThreadPoolExecutor
+        self._audio_executor = None  # type: ThreadPoolExecutor
+        self._pending_audio = None  # type: asyncio.Future
 
     def update(self):
         """
         This should be called every simulation timestep. Updates vehicle list and keeps vehicle sounds in sync with
         the Sumo simulation.
+        Raises a RuntimeError if sound updates scheduled by update_async() are still pending. When switching from
+        update_async() to update(), await flush_async() first.
         :return: None
         """
+        self._check_no_pending_audio()
         self.ego.update()
-        vehicle_list = traci.vehicle.getIDList()
+        # the vehicles poll their own state in Vehicle.update(), so no states are fetched here
+        frame = self._build_vehicle_frame(traci.vehicle.getIDList(), traci.vehicle.getVehicleClass, lambda vehID: None)
+        self._apply_vehicle_frame(frame)
+
+    async def update_async(self):
+        """
+        Asynchronous counterpart of update(), for use in an asyncio event loop.
+        The TraCI polling is run on a dedicated TraCI worker thread and awaited, so TraCI may safely be used again as
+        soon as this coroutine returns. The resulting sound and listener updates are then handed to a dedicated audio
+        worker thread and are NOT awaited, so that they overlap with the next simulation step and TraCI poll.
+        Ordering guarantees:
+        - the sound updates of each step are applied in call order, and those of a step only begin once those of the
+          previous step have finished.
+        - an exception raised while applying the sound updates of a step is raised by the next call to update_async()
+          or flush_async(). update_async() raises it only after its own step has been scheduled, so no step is lost.
+        In this mode, the ego is split into Ego.fetch_state(), run on the TraCI worker thread, and Ego.apply_state(),
+        run on the audio worker thread. By default, Ego.apply_state() calls Ego.update(), which then must not call
+        TraCI. The vehicle states are polled by the Simulation itself, so overrides of Vehicle.update() and
+        Vehicle.fetch_state() are not used; Vehicle.apply_state() and Vehicle.update_custom_signals() are run on the
+        audio worker thread and must not call TraCI.
+        TraCI must not be used by the caller while an update_async() call is in progress.
+        :return: None
+        """
+        loop = asyncio.get_event_loop()
+        self._start_workers()
+        ego_state, frame = await loop.run_in_executor(self._traci_executor, self._fetch_frame)
+        pending, self._pending_audio = self._pending_audio, None
+        try:
+            if pending is not None:
+                await pending
+        finally:
+            self._pending_audio = loop.run_in_executor(self._audio_executor, self._apply_frame, ego_state, frame)
+
+    async def step_async(self):
+        """
+        Advances the Sumo simulation by one step on the TraCI worker thread and then calls update_async().
+        :return: None
+        """
+        loop = asyncio.get_event_loop()
+        self._start_workers()
+        await loop.run_in_executor(self._traci_executor, traci.simulationStep)
+        await self.update_async()
+
+    async def flush_async(self):
+        """
+        Waits until the sound updates scheduled by the last call to update_async() have been applied.
+        :return: None
+        """
+        pending, self._pending_audio = self._pending_audio, None
+        if pending is not None:
+            await pending
+
+    def _check_no_pending_audio(self):
+        """
+        Ensures that no sound updates scheduled by update_async() are still being applied on the audio worker thread.
+        Raises the exception of the last scheduled update, if any.
+        :return: None
+        """
+        if self._pending_audio is None:
+            return
+        if not self._pending_audio.done():
+            raise RuntimeError("Sound updates from update_async() are still pending. Await flush_async() first.")
+        pending, self._pending_audio = self._pending_audio, None
+        pending.result()
+
+    def _start_workers(self):
+        """Creates the single-threaded TraCI and audio workers used by the asynchronous API, if necessary."""
+        if self._traci_executor is None:
+            self._traci_executor = ThreadPoolExecutor(max_workers=1)
+            self._audio_executor = ThreadPoolExecutor(max_workers=1)
+
+    def _fetch_frame(self):
+        """Polls the ego and vehicle states from TraCI. Run on the TraCI worker thread by update_async()."""
+        return self.ego.fetch_state(), self._fetch_vehicle_frame()
+
+    def _apply_frame(self, ego_state, frame):
+        """Applies the ego and vehicle states to the sounds. Run on the audio worker thread by update_async()."""
+        self.ego.apply_state(ego_state)
+        self._apply_vehicle_frame(frame)
+
+    def _fetch_vehicle_frame(self):
+        """
+        Polls TraCI for added and removed vehicles and the current state of each vehicle.
+        :return: frame to be passed to _apply_vehicle_frame()
+        """
+        return self._build_vehicle_frame(traci.vehicle.getIDList(), self._fetch_vehicle_class,
+                                         Vehicle.read_subscription)
+
+    def _fetch_vehicle_class(self, vehID):
+        """
+        Queries the vClass of a new vehicle from TraCI. Vehicles with a mapped vClass are subscribed, so that their
+        state can be polled.
+        :param vehID: id of the Sumo vehicle
+        :return: Sumo vClass of the vehicle
+        :type vehID: str
+        """
+        vClass = traci.vehicle.getVehicleClass(vehID)
+        if self.vehicle_class_map.get(vClass) is not None:
+            Vehicle.subscribe_id(vehID)
+        return vClass
+
+    def _build_vehicle_frame(self, vehicle_list, get_vehicle_class, get_state):
+        """
+        Determines which vehicles were added and removed and the current state of each vehicle. No Vehicle objects are
+        created here, since their sounds are loaded with OpenAL. They are created when the frame is applied.
+        :param vehicle_list: IDs of all vehicles currently in the simulation
+        :param get_vehicle_class: callable returning the Sumo vClass for a vehicle ID
+        :param get_state: callable returning the state to be passed to Vehicle.apply_state() for a vehicle ID, or
+            None if the vehicle should instead poll its own state with Vehicle.update()
+        :return: (list of (vehID, vClass) tuples of added vehicles, dict of states by vehicle ID, IDs of removed
+            vehicles) tuple
+        """
         # find newly added vehicles
+        added = []
         for vehID in vehicle_list:
             if self.silent_ego and hasattr(self.ego, "vehID") and vehID == self.ego.vehID:
                 continue
-            if vehID not in self.vehicles:
-                self.add_vehicle(vehID, enabled=False)
-        # update vehicles and find vehicles that have left the simulation
-        to_remove = []
-        for vehID in self.vehicles:
+            if vehID not in self._tracked_vehicles:
+                vClass = get_vehicle_class(vehID)
+                if self.vehicle_class_map.get(vClass) is not None:
+                    self._tracked_vehicles[vehID] = vClass
+                    added.append((vehID, vClass))
+        # poll vehicles and find vehicles that have left the simulation
+        states = dict()
+        removed = []
+        for vehID in self._tracked_vehicles:
             if vehID not in vehicle_list:
-                to_remove.append(vehID)
+                removed.append(vehID)
             else:
+                states[vehID] = get_state(vehID)
+        for vehID in removed:
+            del self._tracked_vehicles[vehID]
+        return added, states, removed
+
+    def _apply_vehicle_frame(self, frame):
+        """
+        Adds, removes, updates, enables, and disables vehicles based on a frame from _fetch_vehicle_frame().
+        Vehicles are added and removed before any vehicle is updated, so that an exception raised while updating a
+        vehicle cannot leave self.vehicles out of sync with the vehicles being tracked.
+        :return: None
+        """
+        added, states, removed = frame
+        for vehID, vClass in added:
+            self.vehicles[vehID] = self._create_vehicle(vehID, vClass)
+        for vehID in removed:
+            vehicle = self.vehicles.pop(vehID, None)
+            if vehicle is not None:
+                vehicle.disable()
+        for vehID, state in states.items():
+            if vehID not in self.vehicles:
+                continue
+            if state is None:
                 self.vehicles[vehID].update()
-        for vehID in to_remove:
-            self.remove_vehicle(vehID)
+            else:
+                self.vehicles[vehID].apply_state(state)
         # enable relevant vehicles
         ex, ey, ez = self.ego.position
         veh_list = self.vehicles.values()
@@ -99,6 +247,19 @@ class Simulation:
                 if veh.enabled:
                     veh.disable()
 
+    def _create_vehicle(self, vehID, vClass):
+        """
+        Creates a Vehicle object for the vehicle with the specified id based on its vClass.
+        :param vehID: id of the Sumo vehicle
+        :param vClass: Sumo vClass of the vehicle
+        :return: the new Vehicle, or None if its vClass is not mapped to a Vehicle subclass
+        :type vehID: str
+        :type vClass: str
+        """
+        if self.vehicle_class_map.get(vClass) is not None:
+            return self.vehicle_class_map[vClass](vehID)
+        return None
+
     def add_vehicle(self, vehID, enabled=True):
         """
         Adds the vehicle with the specified id to the Simulation. The vehicle settings are chosen based on its vClass.
@@ -109,11 +270,13 @@ class Simulation:
         :type enabled: bool
         """
         vClass = traci.vehicle.getVehicleClass(vehID)
-        if vClass in self.vehicle_class_map and self.vehicle_class_map[vClass] is not None:
-            vehicle = self.vehicle_class_map[vClass](vehID)
+        vehicle = self._create_vehicle(vehID, vClass)
+        if vehicle is not None:
+            vehicle.subscribe()
             if enabled:
                 vehicle.enable()
             self.vehicles[vehID] = vehicle
+            self._tracked_vehicles[vehID] = vClass
 
     def remove_vehicle(self, vehID):
         """
@@ -124,6 +287,13 @@ class Simulation:
         """
         self.vehicles[vehID].disable()
         del self.vehicles[vehID]
+        self._tracked_vehicles.pop(vehID, None)
 
     def __del__(self):
-        oalQuit()
+        try:
+            if self._audio_executor is not None:
+                # do not wait, since this may be run by garbage collection on one of the worker threads
+                self._traci_executor.shutdown(wait=False)
+                self._audio_executor.shutdown(wait=False)
+        finally:
+            oalQuit()
@@ -0,0 +1,355 @@
+"""
+Scripted stress-test harness for vehicle turnover and sound source churn.
+
+Scenarios are replayed deterministically against a local stand-in for TraCI, so no Sumo installation or running
+simulation is needed, while the sounds are rendered with the real OpenAL device. For each scenario, a StressReport
+records the vehicle enable()/disable() churn, the OpenAL errors caught by Simulation.update(), and the latency of each
+step, as well as the number of OpenAL sources created and destroyed. Run this module to print reports for the default
+scenarios:
+    python -m SumoSound.StressTest
+"""
+
+import importlib
+import math
+import time
+import warnings
+from .Ego import Ego
+from .Vehicle import Vehicle
+from .Simulation import Simulation
+from .TraCIStandIn import TraCIStandIn
+from typing import Dict, List
+
+class Scenario:
+    """
+    Base class for scripted scenarios. The ego is located at the origin.
+    Subclasses should override step() to add, move, and remove vehicles. Each Scenario object should only be run once.
+    """
+    name = "scenario"
+
+    def __init__(self, steps, step_length=0.1, max_vehicle_count=None):
+        """
+        Initializes a Scenario object.
+        :param steps: number of simulation steps to run
+        :param step_length: length of each simulation step [s]
+        :param max_vehicle_count: max_vehicle_count to pass to the Simulation
+        :type steps: int
+        :type step_length: float
+        :type max_vehicle_count: int
+        """
+        self.steps = steps
+        self.step_length = step_length
+        self.max_vehicle_count = max_vehicle_count
+
+    def step(self, traci, step):
+        """
+        Updates the vehicles in the stand-in simulation for the given step. Called before each simulation update.
+        :param traci: TraCI stand-in to modify
+        :param step: current step number, starting at 0
+        :return: None
+        :type traci: TraCIStandIn
+        :type step: int
+        """
+        raise NotImplementedError
+
+
+class TrafficLightRelease(Scenario):
+    """
+    A queue of vehicles waiting at a red light next to the ego is released all at once, and accelerates away while a
+    platoon of cross traffic departs simultaneously. Exercises mass enable()/disable() and vehicle removal.
+    """
+    name = "traffic light release"
+
+    def __init__(self, queue_length=40, lanes=4, departures=40, release_step=20, steps=400, step_length=0.1,
+                 max_vehicle_count=None):
+        super().__init__(steps, step_length, max_vehicle_count)
+        self.queue_length = queue_length
+        self.lanes = lanes
+        self.departures = departures
+        self.release_step = release_step
+        self._moving = dict()  # type: Dict[str, List[float]]  # vehID: [acceleration, speed, max speed]
+
+    def step(self, traci, step):
+        if step == 0:
+            for i in range(self.queue_length):
+                vClass = "truck" if i % 7 == 0 else "passenger"
+                traci.add("queue" + str(i), vClass, (-5 - 7 * (i // self.lanes), 3.2 * (i % self.lanes), 0), 90)
+        if step == self.release_step:
+            for i in range(self.queue_length):
+                self._moving["queue" + str(i)] = [1.5 + 0.5 * (i % 3), 0, 14]
+            for i in range(self.departures):
+                vehID = "cross" + str(i)
+                traci.add(vehID, "passenger", (3.2 * (i % 2) + 8, -20 - 8 * (i // 2), 0), 0, 10)
+                self._moving[vehID] = [0, 10, 10]
+        for vehID, motion in list(self._moving.items()):
+            acceleration, speed, max_speed = motion
+            motion[1] = speed = min(speed + acceleration * self.step_length, max_speed)
+            vClass, (x, y, z), angle, _ = traci.vehicle.vehicles[vehID]
+            heading = math.radians(angle)
+            position = (x + speed * self.step_length * math.sin(heading),
+                        y + speed * self.step_length * math.cos(heading), z)
+            if position[0] * math.sin(heading) + position[1] * math.cos(heading) > 150:  # past the exit ahead
+                traci.remove(vehID)
+                del self._moving[vehID]
+            else:
+                traci.move(vehID, position, speed=speed)
+
+
+class CutoffOscillation(Scenario):
+    """
+    Vehicles at evenly spaced distances from the ego oscillate back and forth, so that neighboring vehicles swap
+    distance rank every step. Vehicles around the max_vehicle_count cutoff are enabled and disabled repeatedly.
+    """
+    name = "cutoff oscillation"
+
+    def __init__(self, vehicle_count=20, spacing=4, amplitude=3, steps=100, step_length=0.1, max_vehicle_count=10):
+        super().__init__(steps, step_length, max_vehicle_count)
+        self.vehicle_count = vehicle_count
+        self.spacing = spacing
+        self.amplitude = amplitude
+
+    def step(self, traci, step):
+        for i in range(self.vehicle_count):
+            vehID = "osc" + str(i)
+            distance = 20 + self.spacing * i + self.amplitude * (-1) ** (i + step)
+            direction = i * 137.5  # spread the vehicles around the ego
+            position = (distance * math.sin(math.radians(direction)), distance * math.cos(math.radians(direction)), 0)
+            if step == 0:
+                traci.add(vehID, "passenger", position, direction, 1)
+            else:
+                traci.move(vehID, position)
+
+
+class EmergencyEntry(Scenario):
+    """
+    An emergency vehicle drives past the ego through a scene which is already saturated with vehicles. Without a
+    max_vehicle_count, the number of sources exceeds what the OpenAL device supports, exercising the al.ALError
+    fallback.
+    """
+    name = "emergency entry"
+
+    def __init__(self, background=150, entry_step=20, speed=20, steps=320, step_length=0.1, max_vehicle_count=None):
+        super().__init__(steps, step_length, max_vehicle_count)
+        self.background = background
+        self.entry_step = entry_step
+        self.speed = speed
+
+    def step(self, traci, step):
+        t = step * self.step_length
+        for i in range(self.background):
+            vehID = "bg" + str(i)
+            radius = 5 + 55 * i / self.background
+            direction = i * 137.5 + 2 * t * 360 / (2 * math.pi * radius)  # slowly circle the ego at 2 m/s
+            position = (radius * math.sin(math.radians(direction)), radius * math.cos(math.radians(direction)), 0)
+            if step == 0:
+                vClass = ("passenger", "passenger", "truck", "bicycle")[i % 4]
+                traci.add(vehID, vClass, position, (direction + 90) % 360, 2)
+            else:
+                traci.move(vehID, position, (direction + 90) % 360)
+        if step >= self.entry_step:
+            x = -300 + self.speed * (step - self.entry_step) * self.step_length
+            if step == self.entry_step:
+                traci.add("emergency", "emergency", (x, -2, 0), 90, self.speed)
+            elif x > 300:
+                if "emergency" in traci.vehicle.vehicles:
+                    traci.remove("emergency")
+            else:
+                traci.move("emergency", (x, -2, 0))
+
+
+class StressReport:
+    """
+    Results of a scenario run by a StressHarness. The per-step lists cover the scenario steps only; the teardown step,
+    in which all remaining vehicles leave the simulation at once, is reported separately.
+    """
+    def __init__(self, name):
+        self.name = name
+        self.enables = []  # type: List[int]  # vehicles switched from disabled to enabled per step
+        self.disables = []  # type: List[int]  # vehicles switched from enabled to disabled per step, excluding removals
+        self.removals = []  # type: List[int]  # vehicles removed from the Simulation per step
+        self.al_errors = []  # type: List[int]  # al.ALError fallbacks per step
+        self.latencies = []  # type: List[float]  # duration of Simulation.update() per step [s]
+        self.vehicle_counts = []  # type: List[int]  # vehicles in the Simulation per step
+        self.teardown_disables = 0  # enabled vehicles disabled by their removal in the teardown step
+        self.teardown_removals = 0
+        self.teardown_latency = 0.0  # duration of Simulation.update() in the teardown step [s]
+        self.sources_created = 0
+        self.sources_destroyed = 0
+        self.sources_leaked = 0  # sources still alive after all vehicles have left the simulation
+        self.final_max_vehicle_count = None
+
+    def summary(self):
+        """
+        Summarizes the report.
+        :return: dict of summary statistics
+        """
+        churn = [e + d for e, d in zip(self.enables, self.disables)]
+        return {
+            "steps": len(self.latencies),
+            "enables": sum(self.enables),
+            "disables": sum(self.disables),
+            "removals": sum(self.removals),
+            "max_churn_per_step": max(churn, default=0),
+            "mean_churn_per_step": sum(churn) / len(churn) if churn else 0,
+            "al_errors": sum(self.al_errors),
+            "worst_step_latency": max(self.latencies, default=0),
+            "worst_step": self.latencies.index(max(self.latencies)) if self.latencies else None,
+            "mean_step_latency": sum(self.latencies) / len(self.latencies) if self.latencies else 0,
+            "max_vehicles": max(self.vehicle_counts, default=0),
+            "teardown_disables": self.teardown_disables,
+            "teardown_removals": self.teardown_removals,
+            "teardown_latency": self.teardown_latency,
+            "sources_created": self.sources_created,
+            "sources_destroyed": self.sources_destroyed,
+            "sources_leaked": self.sources_leaked,
+            "final_max_vehicle_count": self.final_max_vehicle_count
+        }
+
+    def __str__(self):
+        s = self.summary()
+        return "\n".join([
+            "Scenario: " + self.name,
+            "  steps: {steps}, max vehicles: {max_vehicles}".format(**s),
+            "  enable/disable churn: {enables} enables, {disables} disables, "
+            "max {max_churn_per_step} per step, mean {mean_churn_per_step:.2f} per step".format(**s),
+            "  removals: {removals}".format(**s),
+            "  al.ALError fallbacks: {al_errors}, final max_vehicle_count: {final_max_vehicle_count}".format(**s),
+            "  step latency: worst {:.2f} ms (step {}), mean {:.2f} ms".format(
+                s["worst_step_latency"] * 1000, s["worst_step"], s["mean_step_latency"] * 1000),
+            "  teardown: {} disables, {} removals, latency {:.2f} ms".format(
+                s["teardown_disables"], s["teardown_removals"], s["teardown_latency"] * 1000),
+            "  sources: {sources_created} created, {sources_destroyed} destroyed, "
+            "{sources_leaked} leaked".format(**s)
+        ])
+
+
+class StressHarness:
+    """
+    Runs Scenarios against a TraCIStandIn and a stationary Ego at the origin. The sound files of all vehicle classes
+    are loaded before each run, so the step latencies do not include file I/O.
+    Only one StressHarness should be created per process, since it creates an Ego. The Simulations of all runs are
+    kept alive until close() is called, since deleting a Simulation shuts down OpenAL.
+    """
+    def __init__(self, vehicle_class_map=None):
+        """
+        Initializes a StressHarness object.
+        :param vehicle_class_map: dict with Sumo vClass as keys and Vehicle subclass as values
+        :type vehicle_class_map: dict[str: Vehicle]
+        """
+        self.vehicle_class_map = vehicle_class_map
+        self.ego = Ego()
+        self._simulations = []  # type: List[Simulation]
+
+    def run(self, scenario):
+        """
+        Runs a scenario, then removes all vehicles and runs one more update (the teardown step) to check for leaked
+        sources. Only actual state changes are counted as enables and disables, not calls to enable() on an enabled
+        vehicle or disable() on a disabled one. Vehicles disabled because they left the simulation are counted as
+        removals rather than disables, except in the teardown step.
+        :param scenario: scenario to run
+        :return: report of the run
+        :type scenario: Scenario
+        :rtype: StressReport
+        """
+        report = StressReport(scenario.name)
+        stand_in = TraCIStandIn()
+        live_sources = set()
+        calls = {"enable": 0, "disable": []}
+        sounds_module = importlib.import_module(".Sounds", __package__)
+        original_source = sounds_module.Source
+        original_enable, original_disable = Vehicle.enable, Vehicle.disable
+
+        class CountingSource(original_source):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                report.sources_created += 1
+                live_sources.add(id(self))
+
+            def destroy(self):
+                super().destroy()
+                report.sources_destroyed += 1
+                live_sources.discard(id(self))
+
+        def counting_enable(vehicle):
+            was_enabled = vehicle.enabled
+            original_enable(vehicle)
+            if not was_enabled and vehicle.enabled:
+                calls["enable"] += 1
+
+        def counting_disable(vehicle):
+            was_enabled = vehicle.enabled
+            original_disable(vehicle)
+            if was_enabled and not vehicle.enabled:
+                calls["disable"].append(vehicle.id)
+
+        sounds_module.Source = CountingSource
+        Vehicle.enable, Vehicle.disable = counting_enable, counting_disable
+        try:
+            simulation = Simulation(self.ego, self.vehicle_class_map, max_vehicle_count=scenario.max_vehicle_count)
+            self._simulations.append(simulation)
+            self._preload_sounds(simulation.vehicle_class_map)
+            with stand_in.installed():
+                for step in range(scenario.steps + 1):
+                    teardown = step == scenario.steps
+                    if teardown:
+                        stand_in.remove_all()
+                    else:
+                        scenario.step(stand_in, step)
+                    stand_in.simulationStep()
+                    calls["enable"], calls["disable"] = 0, []
+                    vehicles_before = set(simulation.vehicles)
+                    with warnings.catch_warnings(record=True) as caught:
+                        warnings.simplefilter("always", RuntimeWarning)
+                        start = time.perf_counter()
+                        simulation.update()
+                        latency = time.perf_counter() - start
+                    removed = vehicles_before - set(simulation.vehicles)
+                    if teardown:
+                        report.teardown_disables = len(calls["disable"])
+                        report.teardown_removals = len(removed)
+                        report.teardown_latency = latency
+                        continue
+                    report.enables.append(calls["enable"])
+                    report.disables.append(len([vehID for vehID in calls["disable"] if vehID not in removed]))
+                    report.removals.append(len(removed))
+                    al_errors = [w for w in caught if str(w.message).startswith("Failed to add vehicle")]
+                    report.al_errors.append(len(al_errors))
+                    report.latencies.append(latency)
+                    report.vehicle_counts.append(len(simulation.vehicles))
+            report.sources_leaked = len(live_sources)
+            report.final_max_vehicle_count = simulation.max_vehicle_count
+        finally:
+            sounds_module.Source = original_source
+            Vehicle.enable, Vehicle.disable = original_enable, original_disable
+        return report
+
+    @staticmethod
+    def _preload_sounds(vehicle_class_map):
+        """
+        Loads the sound buffers of every Vehicle subclass in the map, so that loading the sound files is not included
+        in the measured step latencies. Creating a Vehicle loads its sounds, but creates no sources.
+        :param vehicle_class_map: dict with Sumo vClass as keys and Vehicle subclass as values
+        :return: None
+        """
+        for vehicle_class in set(vehicle_class_map.values()):
+            if vehicle_class is not None:
+                vehicle_class("preload")
+
+    def close(self):
+        """Releases the Simulations of all runs, which shuts down OpenAL."""
+        self._simulations = []
+
+
+def default_scenarios():
+    """
+    Creates the default set of scenarios.
+    :return: list of scenarios
+    :rtype: List[Scenario]
+    """
+    return [TrafficLightRelease(), CutoffOscillation(), EmergencyEntry()]
+
+
+if __name__ == "__main__":
+    harness = StressHarness()
+    for s in default_scenarios():
+        print(harness.run(s))
+    harness.close()
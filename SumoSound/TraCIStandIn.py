@@ -0,0 +1,91 @@
+"""
+Local stand-in for the subset of the TraCI API used by SumoSound, for running SumoSound without Sumo.
+"""
+
+import contextlib
+import importlib
+import traci.constants as tc
+from typing import Dict
+
+_PATCHED_MODULES = ["Ego", "Vehicle", "Simulation", "SharedState"]  # modules whose traci reference is replaced
+
+
+class _VehicleDomainStandIn:
+    """Stand-in for the traci.vehicle domain, implementing the calls used by SumoSound."""
+    def __init__(self):
+        self.vehicles = dict()  # type: Dict[str, list]
+        self.subscriptions = set()
+
+    def getIDList(self):
+        return list(self.vehicles.keys())
+
+    def getVehicleClass(self, vehID):
+        return self.vehicles[vehID][0]
+
+    def subscribe(self, vehID, varIDs=()):
+        self.subscriptions.add(vehID)
+
+    def getSubscriptionResults(self, vehID):
+        if vehID not in self.subscriptions or vehID not in self.vehicles:
+            return dict()
+        vClass, position, angle, speed = self.vehicles[vehID]
+        return {tc.VAR_POSITION3D: position, tc.VAR_ANGLE: angle, tc.VAR_SPEED: speed}
+
+
+class TraCIStandIn:
+    """
+    Local stand-in for the subset of the TraCI API used by SumoSound. Vehicles are added, moved, and removed by
+    scripts instead of by Sumo.
+    """
+    def __init__(self):
+        self.vehicle = _VehicleDomainStandIn()
+        self.step = 0
+
+    def simulationStep(self):
+        self.step += 1
+
+    def add(self, vehID, vClass, position, angle=0, speed=0):
+        """
+        Inserts a vehicle into the stand-in simulation.
+        :param vehID: vehicle ID
+        :param vClass: Sumo vClass of the vehicle
+        :param position: 3-component position vector
+        :param angle: geographic angle (CW from North) [deg]
+        :param speed: speed [m/s]
+        :return: None
+        """
+        self.vehicle.vehicles[vehID] = [vClass, position, angle, speed]
+
+    def move(self, vehID, position, angle=None, speed=None):
+        """Sets the position and, optionally, the angle and speed of a vehicle."""
+        state = self.vehicle.vehicles[vehID]
+        state[1] = position
+        if angle is not None:
+            state[2] = angle
+        if speed is not None:
+            state[3] = speed
+
+    def remove(self, vehID):
+        """Removes a vehicle from the stand-in simulation."""
+        del self.vehicle.vehicles[vehID]
+        self.vehicle.subscriptions.discard(vehID)
+
+    def remove_all(self):
+        """Removes all vehicles from the stand-in simulation."""
+        for vehID in self.vehicle.getIDList():
+            self.remove(vehID)
+
+    @contextlib.contextmanager
+    def installed(self):
+        """
+        Context manager which replaces the traci module used by SumoSound with this stand-in, and restores it on exit.
+        """
+        modules = [importlib.import_module("." + name, __package__) for name in _PATCHED_MODULES]
+        original_traci = [module.traci for module in modules]
+        for module in modules:
+            module.traci = self
+        try:
+            yield self
+        finally:
+            for module, traci in zip(modules, original_traci):
+                module.traci = traci
@@ -15,7 +15,7 @@ _pkg_dir = os.path.dirname(os.path.abspath(__file__))
 class Vehicle:
     def __init__(self, id):
         self.id = id
-        traci.vehicle.subscribe(id, [tc.VAR_POSITION3D, tc.VAR_ANGLE, tc.VAR_SPEED])
+        self.subscribed = False
         self.position = (0, 0, 0)
         self.angle = 0
         self.speed = 0
@@ -106,17 +106,58 @@ class Vehicle:
         """Override this method to add custom signal-updating logic. Called by update() before update_sounds()."""
         pass
 
-    def update(self):
-        subscription_result = traci.vehicle.getSubscriptionResults(self.id)
+    @staticmethod
+    def subscribe_id(vehID):
+        """
+        Adds a TraCI subscription for the vehicle variables read by read_subscription().
+        :param vehID: id of the Sumo vehicle
+        :return: None
+        :type vehID: str
+        """
+        traci.vehicle.subscribe(vehID, [tc.VAR_POSITION3D, tc.VAR_ANGLE, tc.VAR_SPEED])
+
+    @staticmethod
+    def read_subscription(vehID):
+        """
+        Reads the subscription data of a vehicle subscribed with subscribe_id().
+        :param vehID: id of the Sumo vehicle
+        :return: (position, angle, speed) tuple
+        :type vehID: str
+        """
+        subscription_result = traci.vehicle.getSubscriptionResults(vehID)
         position = subscription_result[tc.VAR_POSITION3D]
         angle = subscription_result[tc.VAR_ANGLE]
         speed = subscription_result[tc.VAR_SPEED]
-        self.position = position
-        self.angle = angle
-        self.speed = speed
+        return position, angle, speed
+
+    def subscribe(self):
+        """Adds a TraCI subscription for the vehicle"""
+        self.subscribe_id(self.id)
+        self.subscribed = True
+
+    def fetch_state(self):
+        """
+        Polls the vehicle subscription data from TraCI without modifying the Vehicle or its sounds.
+        The subscription is added on the first call.
+        :return: (position, angle, speed) tuple to be passed to apply_state()
+        """
+        if not self.subscribed:
+            self.subscribe()
+        return self.read_subscription(self.id)
+
+    def apply_state(self, state):
+        """
+        Updates the vehicle and its sounds from a state previously returned by fetch_state(). Makes no TraCI calls.
+        :param state: (position, angle, speed) tuple
+        :return: None
+        """
+        self.position, self.angle, self.speed = state
         self.update_custom_signals()
         self.update_sounds()
 
+    def update(self):
+        self.apply_state(self.fetch_state())
+
     def __del__(self):
         for sound in self.sounds:
             del sound
@@ -4,7 +4,7 @@ Python library to generate sound effects for a Sumo traffic simulation using Tra
 Author: Patrick Malcolm
 """
 
-__all__ = ["Vehicle", "Sounds", "Ego", "Simulation"]
+__all__ = ["Vehicle", "Sounds", "Ego", "Simulation", "SharedState", "StressTest", "TraCIStandIn"]
 __version__ = "1.0.2"
 
 import os
@@ -24,3 +24,4 @@ from .Vehicle import *
 from .Sounds import *
 from .Ego import *
 from .Simulation import *
+from .SharedState import *
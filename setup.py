@@ -27,11 +27,11 @@ setup(
     'Topic :: Scientific/Engineering',
     'License :: OSI Approved :: MIT License',
     'Programming Language :: Python :: 3',
-    'Programming Language :: Python :: 3.4',
     'Programming Language :: Python :: 3.5',
     'Programming Language :: Python :: 3.6',
     'Programming Language :: Python :: 3.7',
     'Programming Language :: Python :: 3.8'
   ],
+  python_requires='>=3.5',
   package_data={'SumoSound': ['stock_sounds/*.wav']}
 )
@@ -0,0 +1,29 @@
+"""
+Shared objects for the SumoSound tests.
+"""
+
+import SumoSound
+
+_ego = None
+_simulations = []
+
+
+def shared_ego():
+    """
+    Returns a stationary Ego at the origin, shared by all tests, since only one Ego may be created per process.
+    :rtype: SumoSound.Ego
+    """
+    global _ego
+    if _ego is None:
+        _ego = SumoSound.Ego()
+    return _ego
+
+
+def keep_alive(simulation):
+    """
+    Keeps a Simulation referenced until the end of the test run, since deleting a Simulation shuts down OpenAL.
+    :param simulation: Simulation to keep alive
+    :return: the same Simulation
+    """
+    _simulations.append(simulation)
+    return simulation
@@ -0,0 +1,145 @@
+"""
+Tests for the shared-memory state feed between the Sumo process and the audio process.
+"""
+
+import itertools
+import os
+import subprocess
+import sys
+import unittest
+import warnings
+import SumoSound
+from SumoSound import SharedState
+from SumoSound.TraCIStandIn import TraCIStandIn
+from helpers import keep_alive, shared_ego
+
+_repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_block_numbers = itertools.count()
+
+_CONSUMER_SCRIPT = """
+import sys
+import SumoSound
+simulation = SumoSound.SharedMemorySimulation(sys.argv[1], SumoSound.Ego())
+frame_number, ego_state, records = simulation.read_frame()
+print(frame_number, ",".join(record[0] for record in records))
+simulation.close()
+"""
+
+
+def _block_name():
+    return "ss" + str(os.getpid()) + "_" + str(next(_block_numbers))
+
+
+@unittest.skipIf(SharedState.shared_memory is None, "requires Python 3.8 or newer")
+class TestSharedStateRoundTrip(unittest.TestCase):
+    def setUp(self):
+        self.stand_in = TraCIStandIn()
+        installed = self.stand_in.installed()
+        installed.__enter__()
+        self.addCleanup(installed.__exit__, None, None, None)
+
+    def start(self, **kwargs):
+        name = _block_name()
+        producer = SumoSound.SharedStateProducer(name, **kwargs)
+        self.addCleanup(producer.unlink)
+        self.addCleanup(producer.close)
+        consumer = keep_alive(SumoSound.SharedMemorySimulation(name, shared_ego()))
+        self.addCleanup(consumer.close)
+        return producer, consumer
+
+    def test_no_frame_published(self):
+        producer, consumer = self.start()
+        self.assertIsNone(consumer.read_frame())
+
+    def test_ego_present_and_absent(self):
+        producer, consumer = self.start(ego_id="ego")
+        self.stand_in.add("ego", "passenger", (1.0, 2.0, 0.0), 90, 5)
+        self.stand_in.add("car1", "truck", (10.0, 0.0, 0.0), 180, 3)
+        producer.update()
+        frame_number, ego_state, records = consumer.read_frame()
+        self.assertEqual(frame_number, 1)
+        self.assertEqual(ego_state, ((1.0, 2.0, 0.0), 90, 5))
+        self.assertEqual(records, [("ego", "passenger", (1.0, 2.0, 0.0), 90, 5),
+                                   ("car1", "truck", (10.0, 0.0, 0.0), 180, 3)])
+        self.stand_in.remove("ego")
+        producer.update()
+        frame_number, ego_state, records = consumer.read_frame()
+        self.assertEqual(frame_number, 2)
+        self.assertIsNone(ego_state)
+        self.assertEqual([record[0] for record in records], ["car1"])
+
+    def test_consumer_update_applies_frame(self):
+        producer, consumer = self.start()
+        self.stand_in.add("car1", "passenger", (10.0, 0.0, 0.0), 90, 5)
+        producer.update()
+        consumer.update()
+        self.assertEqual(list(consumer.vehicles), ["car1"])
+        self.assertEqual(consumer.vehicles["car1"].position, (10.0, 0.0, 0.0))
+        self.stand_in.remove("car1")
+        producer.update()
+        consumer.update()
+        self.assertEqual(consumer.vehicles, dict())
+
+    def test_overflow_keeps_closest_vehicles(self):
+        producer, consumer = self.start(ego_id="ego", max_vehicles=3)
+        self.stand_in.add("ego", "passenger", (0.0, 0.0, 0.0))
+        for distance in (40, 10, 30, 20):
+            self.stand_in.add("car" + str(distance), "passenger", (float(distance), 0.0, 0.0))
+        with self.assertWarns(RuntimeWarning):
+            producer.update()
+        records = consumer.read_frame()[2]
+        self.assertEqual([record[0] for record in records], ["ego", "car10", "car20"])
+
+    def test_long_id_skipped(self):
+        producer, consumer = self.start()
+        self.stand_in.add("x" * 65, "passenger", (1.0, 0.0, 0.0))
+        self.stand_in.add("y" * 65, "passenger", (2.0, 0.0, 0.0))
+        self.stand_in.add("car1", "passenger", (3.0, 0.0, 0.0))
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            producer.update()
+            producer.update()
+        self.assertEqual(len([w for w in caught if issubclass(w.category, RuntimeWarning)]), 1)
+        self.assertEqual([record[0] for record in consumer.read_frame()[2]], ["car1"])
+
+
+@unittest.skipIf(SharedState.shared_memory is None, "requires Python 3.8 or newer")
+class TestSharedMemoryConsumerProcess(unittest.TestCase):
+    def setUp(self):
+        self.stand_in = TraCIStandIn()
+        installed = self.stand_in.installed()
+        installed.__enter__()
+        self.addCleanup(installed.__exit__, None, None, None)
+        self.name = _block_name()
+        self.producer = SumoSound.SharedStateProducer(self.name, ego_id="ego")
+
+    def tearDown(self):
+        self.producer.close()
+        try:
+            self.producer.unlink()
+        except FileNotFoundError:
+            pass
+
+    def run_consumer(self):
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [_repo_dir, env.get("PYTHONPATH")]))
+        result = subprocess.run([sys.executable, "-c", _CONSUMER_SCRIPT, self.name], env=env,
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True, timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return result.stdout.split()
+
+    def test_consumer_exit_does_not_unlink_block(self):
+        self.stand_in.add("ego", "passenger", (0, 0, 0))
+        self.stand_in.add("car1", "passenger", (10, 0, 0), 90, 5)
+        self.producer.update()
+        self.assertEqual(self.run_consumer(), ["1", "ego,car1"])
+        # a restarted audio process must be able to re-attach and see new frames
+        self.stand_in.remove("car1")
+        self.producer.update()
+        self.assertEqual(self.run_consumer(), ["2", "ego"])
+        self.producer.close()
+        self.producer.unlink()  # raises FileNotFoundError if a consumer unlinked the block
+
+
+if __name__ == "__main__":
+    unittest.main()
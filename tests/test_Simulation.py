@@ -0,0 +1,129 @@
+"""
+Tests for the synchronous and asynchronous update paths of Simulation.
+"""
+
+import asyncio
+import threading
+import unittest
+import SumoSound
+from SumoSound.TraCIStandIn import TraCIStandIn
+from helpers import keep_alive, shared_ego
+
+# (step, action, vehID, x) entries applied to the stand-in before the given step
+_SCRIPT = [
+    (0, "add", "car1", 30), (0, "add", "car2", 10), (0, "add", "truck1", 20),
+    (1, "move", "car1", 5), (1, "add", "car3", 40),
+    (2, "remove", "car2", None), (2, "move", "car3", 1),
+    (3, "remove", "truck1", None), (3, "add", "car4", 15),
+    (4, "move", "car1", 50),
+    (5, "remove", "car3", None),
+]
+_STEP_COUNT = 6
+
+
+class _FailingVehicle(SumoSound.Vehicle):
+    """Vehicle class whose next state updates raise an exception, as many times as set in failures_left."""
+    failures_left = 0
+
+    def apply_state(self, state):
+        if _FailingVehicle.failures_left > 0:
+            _FailingVehicle.failures_left -= 1
+            raise ValueError("audio step failed")
+        super().apply_state(state)
+
+
+class _BlockingVehicle(SumoSound.Vehicle):
+    """Vehicle whose state updates wait until released."""
+    release = threading.Event()
+
+    def apply_state(self, state):
+        self.release.wait(10)
+        super().apply_state(state)
+
+
+class TestSimulationAsync(unittest.TestCase):
+    def setUp(self):
+        self.stand_in = TraCIStandIn()
+        installed = self.stand_in.installed()
+        installed.__enter__()
+        self.addCleanup(installed.__exit__, None, None, None)
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+
+    def make_simulation(self, **kwargs):
+        return keep_alive(SumoSound.Simulation(shared_ego(), **kwargs))
+
+    def play_script(self, step):
+        for script_step, action, vehID, x in _SCRIPT:
+            if script_step != step:
+                continue
+            if action == "add":
+                self.stand_in.add(vehID, "truck" if vehID.startswith("truck") else "passenger", (x, 0, 0), 90, 10)
+            elif action == "move":
+                self.stand_in.move(vehID, (x, 0, 0))
+            else:
+                self.stand_in.remove(vehID)
+
+    @staticmethod
+    def snapshot(simulation):
+        return (sorted(simulation.vehicles),
+                sorted(vehID for vehID, vehicle in simulation.vehicles.items() if vehicle.enabled))
+
+    def run_sync(self, step_count):
+        self.stand_in.remove_all()
+        simulation = self.make_simulation(max_vehicle_count=1)
+        for step in range(step_count):
+            self.play_script(step)
+            self.stand_in.simulationStep()
+            simulation.update()
+        return self.snapshot(simulation)
+
+    def run_async(self, step_count):
+        self.stand_in.remove_all()
+        simulation = self.make_simulation(max_vehicle_count=1)
+
+        async def run():
+            for step in range(step_count):
+                self.play_script(step)
+                await simulation.step_async()
+            await simulation.flush_async()
+        self.loop.run_until_complete(run())
+        return self.snapshot(simulation)
+
+    def test_step_async_matches_update(self):
+        for step_count in range(1, _STEP_COUNT + 1):
+            with self.subTest(step_count=step_count):
+                self.assertEqual(self.run_async(step_count), self.run_sync(step_count))
+
+    def test_audio_exception_raised_by_next_update_async(self):
+        simulation = self.make_simulation(vehicle_class_map={"passenger": _FailingVehicle})
+        _FailingVehicle.failures_left = 1
+
+        async def run():
+            self.stand_in.add("car1", "passenger", (10, 0, 0))
+            await simulation.update_async()
+            self.stand_in.add("car2", "passenger", (20, 0, 0))
+            with self.assertRaises(ValueError):
+                await simulation.update_async()
+            await simulation.flush_async()
+        self.loop.run_until_complete(run())
+        # the step scheduled by the update_async() call which raised the exception must not be lost
+        self.assertEqual(sorted(simulation.vehicles), ["car1", "car2"])
+        self.assertEqual(simulation.vehicles["car1"].position, (10, 0, 0))
+
+    def test_update_raises_while_audio_pending(self):
+        simulation = self.make_simulation(vehicle_class_map={"passenger": _BlockingVehicle})
+        _BlockingVehicle.release.clear()
+        self.addCleanup(_BlockingVehicle.release.set)
+        self.stand_in.add("car1", "passenger", (10, 0, 0))
+        self.loop.run_until_complete(simulation.update_async())
+        with self.assertRaises(RuntimeError):
+            simulation.update()
+        _BlockingVehicle.release.set()
+        self.loop.run_until_complete(simulation.flush_async())
+        simulation.update()
+        self.assertEqual(list(simulation.vehicles), ["car1"])
+
+
+if __name__ == "__main__":
+    unittest.main()